@@ -10,6 +10,55 @@ def find_freq(changes):
     return sum(changes)
 
 find_freq(seq)
+#%%
+import io
+import mmap
+import sys
+from array import array
+from itertools import accumulate
+
+
+def read_chunks(source, chunk_size=1 << 20):
+    # source is a path, "-" for stdin, a binary file object or an mmap;
+    # yields the changes as array('q') chunks, cut on line boundaries
+    if source == "-":
+        source = sys.stdin.buffer
+    if isinstance(source, str):
+        with open(source, "rb") as ifile:
+            if ifile.seek(0, 2) == 0:
+                return
+            with mmap.mmap(ifile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from read_chunks(mm, chunk_size)
+        return
+
+    tail = b""
+    while True:
+        block = source.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        block, tail = block[:cut], block[cut:]
+        yield array("q", map(int, block.split()))
+    if tail.strip():
+        yield array("q", map(int, tail.split()))
+
+
+def find_freq_stream(source, prefix=False, chunk_size=1 << 20):
+    total = 0
+    sums = array("q") if prefix else None
+    for chunk in read_chunks(source, chunk_size):
+        if prefix:
+            sums.extend(total + s for s in accumulate(chunk))
+        total += sum(chunk)
+    return total, sums
+
+
+total, sums = find_freq_stream("input.txt", prefix=True, chunk_size=64)
+assert total == find_freq(seq)
+assert list(sums) == list(accumulate(seq))
+assert find_freq_stream(io.BytesIO(b"+3\n+3\n+4\n-2\n-4"), chunk_size=4) == (4, None)
+
 #%%
 def calibrate(changes):
     d = defaultdict(int)
@@ -29,6 +78,95 @@ assert calibrate([+3, +3, +4, -2, -4]) == 10
 assert calibrate([-6, +3, +8, +5, -6]) == 5
 assert calibrate ([+7, +7, -2, -7, -4]) == 14
 
+#%%
+def calibrate_cycles(changes):
+    # every frequency reached is s + k * drift, with s one of the frequencies
+    # of the first pass; a later value can only repeat an earlier one from
+    # the same residue class modulo the drift, after (s_i - s_j) / drift passes
+    index = {}
+    f = 0
+    for j, c in enumerate(changes):
+        if f in index:
+            return f
+        index[f] = j
+        f += c
+
+    drift = f
+    if drift == 0:
+        return calibrate(changes)
+
+    # sort on (residue, value in drift direction) packed in a single int
+    step = abs(drift)
+    sign = 1 if drift > 0 else -1
+    low = min(sign * f for f in index)
+    span = max(sign * f for f in index) - low + 1
+    keys = sorted((f % step) * span + sign * f - low for f in index)
+
+    n = len(changes)
+    best_time, best_f = None, None
+    for a, b in zip(keys, keys[1:]):
+        if a // span != b // span:
+            continue
+        passes = (b - a) // step
+        f = sign * (a % span + low)
+        time = passes * n + index[f]
+        if best_time is None or time < best_time:
+            best_time, best_f = time, f + passes * drift
+    return best_f
+
+
+assert calibrate_cycles([+1, -1]) == 0
+assert calibrate_cycles([+3, +3, +4, -2, -4]) == 10
+assert calibrate_cycles([-6, +3, +8, +5, -6]) == 5
+assert calibrate_cycles([+7, +7, -2, -7, -4]) == 14
+assert calibrate_cycles([-3, -3, -4, +2, +4]) == -10
+
+#%%
+
+calibrate_cycles(seq)
+
+#%%
+import random
+import time
+
+
+def generate_changes(n, drift=97, passes=200):
+    # distinct frequencies in the first pass, ending on the small drift; in
+    # each residue class they are `passes` drifts apart, so the first repeat
+    # takes that many passes
+    freqs = [m % drift + drift * passes * (m // drift) for m in range(1, n)]
+    random.shuffle(freqs)
+    freqs = [0] + freqs + [drift]
+    return [b - a for a, b in zip(freqs, freqs[1:])]
+
+
+def benchmark_calibrate(sizes=(10 ** 5, 10 ** 6, 10 ** 7), loop_limit=10 ** 5):
+    for n in sizes:
+        changes = generate_changes(n)
+
+        start = time.perf_counter()
+        fast = calibrate_cycles(changes)
+        fast_time = time.perf_counter() - start
+
+        if n > loop_limit:
+            print(f"n={n}: calibrate_cycles {fast_time:.2f}s, calibrate skipped")
+            continue
+        start = time.perf_counter()
+        slow = calibrate(changes)
+        slow_time = time.perf_counter() - start
+        assert fast == slow
+        print(f"n={n}: calibrate_cycles {fast_time:.2f}s, calibrate {slow_time:.2f}s")
+
+
+test_changes = generate_changes(1000, drift=7, passes=20)
+assert calibrate_cycles(test_changes) == calibrate(test_changes)
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    benchmark_calibrate()
+
 #%%
 
 calibrate(seq)
@@ -25,6 +25,69 @@ assert count_codes(["abcdef",
 
 count_codes(codes)
 
+#%%
+import time
+from itertools import islice
+from typing import Iterable, Tuple
+
+import numpy as np
+
+def count_twos_threes(codes: List[str]) -> Tuple[int, int]:
+    # one bin per character code (latin-1, so anything past U+00FF raises
+    # UnicodeEncodeError) and a last bin for the padding, which is ignored
+    width = max(len(c) for c in codes)
+    packed = np.frombuffer(
+        b"".join(c.encode("latin-1").ljust(width, b"\0") for c in codes), dtype=np.uint8
+    ).reshape(len(codes), width).astype(np.int64)
+    lengths = np.fromiter(map(len, codes), dtype=np.int64, count=len(codes))
+    packed[np.arange(width) >= lengths[:, None]] = 256
+    bins = packed + 257 * np.arange(len(codes))[:, None]
+    hist = np.bincount(bins.ravel(), minlength=257 * len(codes)).reshape(-1, 257)[:, :256]
+    return int((hist == 2).any(axis=1).sum()), int((hist == 3).any(axis=1).sum())
+
+
+def count_codes_batch(codes: Iterable[str], chunk_size: int = 1 << 14) -> int:
+    twos, threes = 0, 0
+    codes = iter(codes)
+    while True:
+        chunk = list(islice(codes, chunk_size))
+        if not chunk:
+            break
+        chunk_twos, chunk_threes = count_twos_threes(chunk)
+        twos += chunk_twos
+        threes += chunk_threes
+    return twos * threes
+
+
+assert count_codes_batch(iter(["abcdef",
+"bababc",
+"abbcde",
+"abcccd",
+"aabcdd",
+"abcdee",
+"ababab",]), chunk_size=3) == 12
+assert count_codes_batch(codes) == count_codes(codes)
+assert count_codes_batch(["aAbB", "AA", "AAA", "a a", ""]) == count_codes(["aAbB", "AA", "AAA", "a a", ""])
+
+#%%
+def benchmark_count_codes(n: int = 10 ** 6, length: int = 26):
+    letters = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+    rows = np.random.choice(letters, size=(n, length))
+    ids = [r.tobytes().decode() for r in rows]
+
+    for f in [count_codes_batch, count_codes]:
+        start = time.perf_counter()
+        f(ids)
+        elapsed = time.perf_counter() - start
+        print(f"{f.__name__}: {n / elapsed:,.0f} IDs/second")
+
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    benchmark_count_codes()
+
 #%%
 def generate_sequences(codes:List[str]) -> Iterator[str]:
     for c in codes:
@@ -42,5 +105,67 @@ def find_one_char_distance(codes:List[str]) -> str:
 
 find_one_char_distance(codes)
 
+#%%
+from typing import Dict
+
+
+class NearDuplicateIndex:
+    # per position, the hash of the ID without that letter maps to the first
+    # ID seen with it; later IDs on the same key go to a collision list
+    def __init__(self):
+        self.codes: List[str] = []
+        self._first: List[Dict[int, int]] = []
+        self._more: Dict[Tuple[int, int], List[int]] = {}
+
+    def add(self, code: str) -> List[Tuple[str, str]]:
+        while len(self._first) < len(code):
+            self._first.append({})
+        index = len(self.codes)
+        self.codes.append(code)
+        matches = []
+        for i in range(len(code)):
+            # 30-bit keys are the smallest Python ints
+            key = hash(code[:i] + code[i + 1 :]) & 0x3FFFFFFF
+            first = self._first[i].setdefault(key, index)
+            if first == index:
+                continue
+            more = self._more.setdefault((i, key), [])
+            for j in [first] + more:
+                other = self.codes[j]
+                # hashes can collide, so confirm on the actual IDs
+                if (
+                    len(other) == len(code)
+                    and other != code
+                    and other[:i] == code[:i]
+                    and other[i + 1 :] == code[i + 1 :]
+                ):
+                    matches.append((other, code))
+            more.append(index)
+        return matches
+
+
+def one_char_distance_pairs(codes: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    index = NearDuplicateIndex()
+    for c in codes:
+        yield from index.add(c)
+
+
+def common_letters(pair: Tuple[str, str]) -> str:
+    a, b = pair
+    return "".join(x for x, y in zip(a, b) if x == y)
+
+
+def find_one_char_distance_stream(codes: Iterable[str]) -> str:
+    return common_letters(next(one_char_distance_pairs(codes)))
+
+
+test_codes = ["abcde", "fghij", "klmno", "pqrst", "fguij", "axcye", "wvxyz"]
+assert find_one_char_distance_stream(test_codes) == "fgij"
+assert list(one_char_distance_pairs(test_codes + ["fghiz"])) == [
+    ("fghij", "fguij"),
+    ("fghij", "fghiz"),
+]
+assert find_one_char_distance_stream(codes) == find_one_char_distance(codes)
+
 
 #%%
@@ -51,4 +51,252 @@ def non_overlapping(lines:List[str]) -> int:
 
 assert non_overlapping(testlines) == 3
 non_overlapping(lines)
+
+#%%
+import time
+
+import numpy as np
+
+
+def coverage_map(coords: List[Tuple[int, int, int, int]]) -> np.ndarray:
+    x, y, lrg, tall = np.array(coords, dtype=np.int64).reshape(-1, 4).T
+    dtype = np.int16 if len(coords) < np.iinfo(np.int16).max else np.int32
+    # 2D difference array: +1 at the top-left corner of each claim, -1 past
+    # its right and bottom edges, +1 past the bottom-right corner
+    diff = np.zeros((int((x + lrg).max()) + 1, int((y + tall).max()) + 1), dtype=dtype)
+    np.add.at(diff, (x, y), 1)
+    np.add.at(diff, (x + lrg, y), -1)
+    np.add.at(diff, (x, y + tall), -1)
+    np.add.at(diff, (x + lrg, y + tall), 1)
+    np.cumsum(diff, axis=0, out=diff)
+    np.cumsum(diff, axis=1, out=diff)
+    return diff
+
+
+def count_overlap_np(lines: List[str]) -> int:
+    _, coords = parselines(lines)
+    if not coords:
+        return 0
+    return int(np.count_nonzero(coverage_map(coords) > 1))
+
+
+def non_overlapping_np(lines: List[str]) -> int:
+    idx, coords = parselines(lines)
+    if not coords:
+        return -1
+    overlaps = coverage_map(coords) > 1
+    # summed area table of the overlapping inches, padded with a zero row/column
+    dtype = np.int32 if overlaps.size < np.iinfo(np.int32).max else np.int64
+    sat = np.zeros((overlaps.shape[0] + 1, overlaps.shape[1] + 1), dtype=dtype)
+    sat[1:, 1:] = overlaps
+    del overlaps
+    np.cumsum(sat, axis=0, out=sat)
+    np.cumsum(sat, axis=1, out=sat)
+
+    x, y, lrg, tall = np.array(coords, dtype=np.int64).reshape(-1, 4).T
+    inside = sat[x + lrg, y + tall] - sat[x, y + tall] - sat[x + lrg, y] + sat[x, y]
+    free = np.flatnonzero(inside == 0)
+    return idx[free[0]] if len(free) else -1
+
+
+assert count_overlap_np(testlines) == 4
+assert non_overlapping_np(testlines) == 3
+assert count_overlap_np([]) == 0
+assert non_overlapping_np([]) == -1
+assert count_overlap_np(lines) == count_overlap(lines)
+assert non_overlapping_np(lines) == non_overlapping(lines)
+
+#%%
+def benchmark_overlap(n_claims: int = 10 ** 5, sheet: int = 10_000, baseline_limit: int = 10 ** 4):
+    x = np.random.randint(0, sheet - 30, n_claims)
+    y = np.random.randint(0, sheet - 30, n_claims)
+    lrg = np.random.randint(1, 30, n_claims)
+    tall = np.random.randint(1, 30, n_claims)
+    claims = [
+        f"{i} {a} {b} {c} {d}" for i, (a, b, c, d) in enumerate(zip(x, y, lrg, tall), 1)
+    ]
+
+    funcs = [count_overlap_np, non_overlapping_np]
+    if n_claims <= baseline_limit:
+        funcs += [count_overlap, non_overlapping]
+    for f in funcs:
+        start = time.perf_counter()
+        f(claims)
+        print(f"{f.__name__}: {time.perf_counter() - start:.2f}s")
+
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    benchmark_overlap()
+
+#%%
+class CoverTree:
+    # segment tree over the compressed y edges, tracking per node how many
+    # claims cover it entirely and the length covered at least once / twice
+    def __init__(self, edges: List[int]):
+        self.edges = edges
+        size = 4 * max(len(edges) - 1, 1)
+        self.count = [0] * size
+        self.once = [0] * size
+        self.twice = [0] * size
+
+    def add(self, start: int, stop: int, value: int):
+        self._add(1, 0, len(self.edges) - 1, start, stop, value)
+
+    def covered_twice(self) -> int:
+        return self.twice[1]
+
+    def _add(self, node: int, lo: int, hi: int, start: int, stop: int, value: int):
+        if stop <= lo or hi <= start:
+            return
+        if start <= lo and hi <= stop:
+            self.count[node] += value
+        else:
+            mid = (lo + hi) // 2
+            self._add(2 * node, lo, mid, start, stop, value)
+            self._add(2 * node + 1, mid, hi, start, stop, value)
+        self._update(node, lo, hi)
+
+    def _update(self, node: int, lo: int, hi: int):
+        length = self.edges[hi] - self.edges[lo]
+        leaf = hi - lo == 1
+        left, right = 2 * node, 2 * node + 1
+        if self.count[node] >= 2:
+            self.once[node] = self.twice[node] = length
+        elif self.count[node] == 1:
+            self.once[node] = length
+            self.twice[node] = 0 if leaf else self.once[left] + self.once[right]
+        elif leaf:
+            self.once[node] = self.twice[node] = 0
+        else:
+            self.once[node] = self.once[left] + self.once[right]
+            self.twice[node] = self.twice[left] + self.twice[right]
+
+
+def count_overlap_sweep(lines: List[str]) -> int:
+    _, coords = parselines(lines)
+    edges = sorted({y for _, y, _, _ in coords} | {y + t for _, y, _, t in coords})
+    position = {y: i for i, y in enumerate(edges)}
+
+    events = []
+    for x, y, lrg, tall in coords:
+        events.append((x, 1, position[y], position[y + tall]))
+        events.append((x + lrg, -1, position[y], position[y + tall]))
+    events.sort()
+
+    tree = CoverTree(edges)
+    area = 0
+    last_x = events[0][0] if events else 0
+    for x, value, start, stop in events:
+        area += tree.covered_twice() * (x - last_x)
+        tree.add(start, stop, value)
+        last_x = x
+    return area
+
+
+class MaxTree:
+    # segment tree over n slots with range updates and range max queries;
+    # updates either add to a range or raise it to at least a value. Tags
+    # stay on the nodes they were applied to instead of being pushed down
+    def __init__(self, n: int, raise_to: bool = False):
+        self.n = max(n, 1)
+        self.raise_to = raise_to
+        self.tag = [0] * (4 * self.n)
+        self.best = [0] * (4 * self.n)
+
+    def update(self, start: int, stop: int, value: int):
+        self._update(1, 0, self.n, start, stop, value)
+
+    def max(self, start: int, stop: int) -> int:
+        return self._max(1, 0, self.n, start, stop)
+
+    def _combine(self, node: int, children: int) -> int:
+        if self.raise_to:
+            return max(self.tag[node], children)
+        return self.tag[node] + children
+
+    def _update(self, node: int, lo: int, hi: int, start: int, stop: int, value: int):
+        if stop <= lo or hi <= start:
+            return
+        if start <= lo and hi <= stop:
+            if self.raise_to:
+                self.tag[node] = max(self.tag[node], value)
+                self.best[node] = max(self.best[node], value)
+            else:
+                self.tag[node] += value
+                self.best[node] += value
+            return
+        mid = (lo + hi) // 2
+        self._update(2 * node, lo, mid, start, stop, value)
+        self._update(2 * node + 1, mid, hi, start, stop, value)
+        self.best[node] = self._combine(
+            node, max(self.best[2 * node], self.best[2 * node + 1])
+        )
+
+    def _max(self, node: int, lo: int, hi: int, start: int, stop: int) -> int:
+        if stop <= lo or hi <= start:
+            return -1
+        if start <= lo and hi <= stop:
+            return self.best[node]
+        mid = (lo + hi) // 2
+        children = max(
+            self._max(2 * node, lo, mid, start, stop),
+            self._max(2 * node + 1, mid, hi, start, stop),
+        )
+        return self._combine(node, children)
+
+
+def non_overlapping_ids(lines: List[str]) -> List[int]:
+    idx, coords = parselines(lines)
+    edges = sorted({y for _, y, _, _ in coords} | {y + t for _, y, _, t in coords})
+    position = {y: i for i, y in enumerate(edges)}
+
+    # sweep along x, closing claims before opening new ones at the same x.
+    # covered counts the open claims over each y slot: a new claim overlaps
+    # an open one if its range is covered. opened keeps the latest opening
+    # time over each y slot: a claim overlaps one opened after it if, when
+    # it closes, its range was opened later than itself
+    events = []
+    for i, (x, y, lrg, tall) in enumerate(coords):
+        events.append((x, 1, i))
+        events.append((x + lrg, 0, i))
+    events.sort()
+
+    covered = MaxTree(len(edges) - 1)
+    opened = MaxTree(len(edges) - 1, raise_to=True)
+    opened_at = [0] * len(coords)
+    overlapping = [False] * len(coords)
+    for time, (_, is_open, i) in enumerate(events, 1):
+        _, y, _, tall = coords[i]
+        start, stop = position[y], position[y + tall]
+        if is_open:
+            if covered.max(start, stop) > 0:
+                overlapping[i] = True
+            covered.update(start, stop, 1)
+            opened.update(start, stop, time)
+            opened_at[i] = time
+        else:
+            covered.update(start, stop, -1)
+            if opened.max(start, stop) > opened_at[i]:
+                overlapping[i] = True
+    return [i for i, over in zip(idx, overlapping) if not over]
+
+
+def non_overlapping_sweep(lines: List[str]) -> int:
+    ids = non_overlapping_ids(lines)
+    return ids[0] if ids else -1
+
+
+assert count_overlap_sweep(testlines) == 4
+assert non_overlapping_sweep(testlines) == 3
+assert count_overlap_sweep(lines) == count_overlap(lines)
+assert non_overlapping_ids(lines) == [non_overlapping(lines)]
+assert count_overlap_sweep([" 1 0 0 5 5", " 2 1 1 2 2", " 3 2 2 2 2", " 4 1000000 1000000 3 3"]) == 7
+stacked = [f"{i} 0 {10 * i} 5 5" for i in range(1, 20_001)]
+assert non_overlapping_ids(stacked) == list(range(1, 20_001))
+assert non_overlapping_ids(stacked + ["20001 4 12 5 5"]) == list(range(2, 20_001))
+assert non_overlapping_ids([" 1 0 0 5 5", " 2 1 1 2 2", " 3 6 6 2 2", " 4 1000000 1000000 3 3"]) == [3, 4]
+
 #%%
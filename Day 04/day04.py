@@ -127,3 +127,99 @@ naps = get_naps(txt)
 print(overall_sleepiest_minute_x_guard(naps))
 
 #%%
+import numpy as np
+
+
+class NapColumns(NamedTuple):
+    id: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+
+def get_nap_columns(text: str) -> NapColumns:
+    # "[1518-11-01 00:05] falls asleep": fixed width up to the comment
+    lines = [l for l in text.split("\n") if l]
+    keys = np.array(
+        [int(l[1:5] + l[6:8] + l[9:11] + l[12:14] + l[15:17]) for l in lines],
+        dtype=np.int64,
+    )
+
+    ids, starts, ends = [], [], []
+    id = None
+    start_nap = None
+    for i in np.argsort(keys, kind="stable"):
+        line = lines[i]
+        kind = line[19]
+        if kind == "G":
+            assert start_nap is None
+            id = int(line[26 : line.index(" ", 26)])
+        elif kind == "f":
+            assert start_nap is None
+            start_nap = int(line[15:17])
+        elif kind == "w":
+            assert start_nap is not None and id is not None
+            ids.append(id)
+            starts.append(start_nap)
+            ends.append(int(line[15:17]))
+            start_nap = None
+    return NapColumns(
+        np.array(ids, dtype=np.int64),
+        np.array(starts, dtype=np.int64),
+        np.array(ends, dtype=np.int64),
+    )
+
+
+def nap_rows(naps: List[Nap]) -> List[Tuple[int, int, int]]:
+    return [(nap.id, nap.start.minute, nap.end.minute) for nap in naps]
+
+
+def nap_column_rows(naps: NapColumns) -> List[Tuple[int, int, int]]:
+    return list(zip(naps.id.tolist(), naps.start.tolist(), naps.end.tolist()))
+
+
+assert nap_column_rows(get_nap_columns(TESTLINES)) == nap_rows(get_naps(TESTLINES))
+assert nap_column_rows(get_nap_columns(txt)) == nap_rows(get_naps(txt))
+
+#%%
+
+
+class SleepMatrix:
+    # minutes asleep per guard (rows) and minute of the hour (columns)
+    def __init__(self, naps: NapColumns):
+        self.ids, rows = np.unique(naps.id, return_inverse=True)
+        diff = np.zeros((len(self.ids), 61), dtype=np.int64)
+        np.add.at(diff, (rows, naps.start), 1)
+        np.add.at(diff, (rows, naps.end), -1)
+        self.minutes = np.cumsum(diff, axis=1)[:, :60]
+        self._row = {id: row for row, id in enumerate(self.ids.tolist())}
+
+    def sleepiest_id(self) -> int:
+        return int(self.ids[np.argmax(self.minutes.sum(axis=1))])
+
+    def sleepiest_minute(self, id: int) -> int:
+        return int(np.argmax(self.minutes[self._row[id]]))
+
+    def sleepiest_guard_x_min(self) -> int:
+        guard = self.sleepiest_id()
+        return guard * self.sleepiest_minute(guard)
+
+    def overall_sleepiest_minute_x_guard(self) -> int:
+        row, minute = np.unravel_index(np.argmax(self.minutes), self.minutes.shape)
+        return int(self.ids[row]) * int(minute)
+
+    def top_guards(self, minute: int, k: int = 1) -> List[Tuple[int, int]]:
+        counts = self.minutes[:, minute]
+        rows = np.argsort(-counts, kind="stable")[:k]
+        return [(int(self.ids[r]), int(counts[r])) for r in rows]
+
+
+test_matrix = SleepMatrix(get_nap_columns(TESTLINES))
+assert test_matrix.sleepiest_guard_x_min() == 240
+assert test_matrix.overall_sleepiest_minute_x_guard() == 4455
+assert test_matrix.top_guards(45, 2) == [(99, 3), (10, 1)]
+
+matrix = SleepMatrix(get_nap_columns(txt))
+assert matrix.sleepiest_guard_x_min() == sleepiest_guard_x_min(txt)
+assert matrix.overall_sleepiest_minute_x_guard() == overall_sleepiest_minute_x_guard(naps)
+
+#%%
@@ -1,5 +1,7 @@
 #%%
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 testpol = "dabAcCaCBAcCcaDA"
 
@@ -24,6 +26,43 @@ with open("input.txt", "r") as infile:
 input_line = lines[0]
 len(react(input_line))
 
+#%%
+import mmap
+import tempfile
+from typing import Union
+
+
+def react_bytes(polymer: bytes, length_only: bool = False) -> Union[bytes, int]:
+    # same unit, opposite polarity: ASCII letters differ only in bit 0x20
+    stack = bytearray(len(polymer))
+    top = 0
+    for c in memoryview(polymer):
+        if c <= 0x20:
+            continue
+        if top and stack[top - 1] ^ c == 0x20:
+            top -= 1
+        else:
+            stack[top] = c
+            top += 1
+    return top if length_only else bytes(stack[:top])
+
+
+def react_file(path: str, length_only: bool = False) -> Union[bytes, int]:
+    with open(path, "rb") as infile:
+        # mmap refuses to map an empty file
+        if infile.seek(0, 2) == 0:
+            return 0 if length_only else b""
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as polymer:
+            return react_bytes(polymer, length_only)
+
+
+assert react_bytes(testpol.encode()) == b"dabCBAcaDA"
+assert react_bytes(bytearray(testpol.encode()), length_only=True) == 10
+assert react_file("input.txt", length_only=True) == len(react(input_line))
+with tempfile.NamedTemporaryFile() as empty:
+    assert react_file(empty.name) == b""
+    assert react_file(empty.name, length_only=True) == 0
+
 
 #%%
 set(testpol.lower())
@@ -47,16 +86,51 @@ assert react_with_remove(testpol, "c") == 4
 assert react_with_remove(testpol, "d") == 6
 
 
-def shortest_polymer(polymer: str) -> int:
-    scores = []
-    for c in set(polymer.lower()):
-        scores.append(react_with_remove(polymer, c))
-    return min(scores)
+def timed_remove(args: Tuple[str, str]) -> Tuple[int, float]:
+    polymer, rm_char = args
+    start = time.perf_counter()
+    length = react_with_remove(polymer, rm_char)
+    return length, time.perf_counter() - start
+
+
+def unit_removals(
+    polymer: str, units: Optional[Iterable[str]] = None, processes: int = 1
+) -> Dict[str, Tuple[int, float]]:
+    # removing a unit never un-reacts a pair, so the reduced polymer gives
+    # the same lengths as the original one
+    reduced = react(polymer)
+    if units is None:
+        units = reduced.lower()
+    units = sorted({u.lower() for u in units})
+    jobs = [(reduced, u) for u in units]
+    if processes == 1:
+        results = list(map(timed_remove, jobs))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(timed_remove, jobs))
+    return dict(zip(units, results))
+
+
+def shortest_polymer(
+    polymer: str, units: Optional[Iterable[str]] = None, processes: int = 1
+) -> int:
+    removals = unit_removals(polymer, units, processes)
+    return min(length for length, _ in removals.values())
 
 
 assert shortest_polymer(testpol) == 4
+assert shortest_polymer(testpol, units="ab") == 6
+assert unit_removals(testpol, units="AB").keys() == {"a", "b"}
+assert shortest_polymer(testpol, units="AB") == 6
+assert unit_removals(testpol)["c"][0] == 4
 #%%
 
 shortest_polymer(input_line)
 
 #%%
+if __name__ == "__main__":
+    # worker processes re-import this file under the spawn start method
+    for unit, (length, seconds) in unit_removals(input_line, processes=4).items():
+        print(f"{unit}: {length} ({seconds * 1000:.1f} ms)")
+
+#%%
@@ -99,27 +99,100 @@ test_coords = parse_text(TESTINPUT)
 count_areas(test_coords)
 
 
+#%%
+import numpy as np
+
+TIED = -1
+
+
+def nearest_labels(coords: List[Coord]) -> np.ndarray:
+    # multi-source BFS: with no obstacles the BFS distance is the Manhattan
+    # one, and the closest coords of a cell are those of its neighbours one
+    # step closer, so a cell is TIED when they disagree or are TIED themselves
+    xs = np.array([c.x for c in coords])
+    ys = np.array([c.y for c in coords])
+    width = xs.max() - xs.min() + 1
+    height = ys.max() - ys.min() + 1
+
+    labels = np.full(width * height, TIED)
+    visited = np.zeros(width * height, dtype=bool)
+    low = np.empty(width * height, dtype=np.int64)
+    high = np.empty(width * height, dtype=np.int64)
+
+    cells = (ys - ys.min()) * width + (xs - xs.min())
+    owners = np.arange(len(coords))
+    while len(cells):
+        low[cells] = len(coords)
+        high[cells] = TIED
+        np.minimum.at(low, cells, owners)
+        np.maximum.at(high, cells, owners)
+        cells = np.unique(cells)
+        labels[cells] = np.where(low[cells] == high[cells], low[cells], TIED)
+        visited[cells] = True
+
+        col = cells % width
+        steps = [
+            (cells[col > 0], -1),
+            (cells[col < width - 1], 1),
+            (cells[cells >= width], -width),
+            (cells[cells < (height - 1) * width], width),
+        ]
+        cells = np.concatenate([c + d for c, d in steps])
+        owners = labels[np.concatenate([c for c, _ in steps])]
+        fresh = ~visited[cells]
+        cells, owners = cells[fresh], owners[fresh]
+
+    return labels.reshape(height, width)
+
+
+def count_areas_np(coords: List[Coord]) -> Tuple[Coord, int]:
+    labels = nearest_labels(coords)
+    areas = np.bincount(labels[labels != TIED], minlength=len(coords))
+    # areas reaching the border of the bounding box extend forever
+    border = np.concatenate([labels[0], labels[-1], labels[:, 0], labels[:, -1]])
+    areas[border[border != TIED]] = 0
+    best = int(np.argmax(areas))
+    return coords[best], int(areas[best])
+
+
+assert count_areas_np(test_coords) == (Coord(5, 5), 17)
+
 #%%
 with open("input.txt", "r") as target:
     coords = parse_text(target.read())
 grid = build_grid(coords)
 
 count_areas(coords)
+count_areas_np(coords)
 
 #%%
 
 
+def axis_distances(values: np.ndarray, treshold: int) -> np.ndarray:
+    # sum of |p - v| over all values, for every p that can still be under
+    # the treshold: past the extremes the sum grows by len(values) per step
+    values = np.sort(values)
+    prefix = np.concatenate([[0], np.cumsum(values)])
+    margin = treshold // len(values) + 1
+    points = np.arange(values[0] - margin, values[-1] + margin + 1)
+    below = np.searchsorted(values, points, side="right")
+    return (
+        points * below
+        - prefix[below]
+        + (prefix[-1] - prefix[below])
+        - points * (len(values) - below)
+    )
+
+
 def count_distances(coords: List[Coord], treshold: int) -> int:
-    grid = build_grid(coords)
-    total_distance = Counter()
-    for loc in grid.all_locations():
-        for coord in coords:
-            total_distance[loc] += loc.distance(coord)
-    values = total_distance.values()
-    return len([v for v in values if v < treshold])
+    # Manhattan distance sums split into an x part and a y part
+    x_sums = axis_distances(np.array([c.x for c in coords]), treshold)
+    y_sums = np.sort(axis_distances(np.array([c.y for c in coords]), treshold))
+    return int(np.searchsorted(y_sums, treshold - x_sums, side="left").sum())
 
 
-count_distances(test_coords, 32)
+assert count_distances(test_coords, 32) == 16
+assert count_distances([Coord(0, 0)], 3) == 13
 
 #%%
 count_distances(coords, 10000)
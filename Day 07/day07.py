@@ -73,12 +73,56 @@ assert len(ready_tasks(tl)) == 1
 
 assert get_seq(tl) == "CABDFE"
 
+#%%
+import heapq
+
+
+class Graph(NamedTuple):
+    ids: Tuple[str, ...]
+    followers: Tuple[Tuple[int, ...], ...]
+    indegree: Tuple[int, ...]
+
+
+def build_graph(tl: TaskList) -> Graph:
+    # task ids are sorted, so comparing indices compares ids
+    ids = tuple(sorted(tl))
+    index = {id: i for i, id in enumerate(ids)}
+    followers = tuple(tuple(index[f] for f in tl[id].followers) for id in ids)
+    indegree = [0] * len(ids)
+    for fs in followers:
+        for f in fs:
+            indegree[f] += 1
+    return Graph(ids, followers, tuple(indegree))
+
+
+def topological_order(graph: Graph) -> List[str]:
+    indegree = list(graph.indegree)
+    ready = [i for i, d in enumerate(indegree) if d == 0]
+    heapq.heapify(ready)
+    order: List[str] = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(graph.ids[i])
+        for f in graph.followers[i]:
+            indegree[f] -= 1
+            if indegree[f] == 0:
+                heapq.heappush(ready, f)
+    return order
+
+
+test_graph = build_graph(parse(test_lines))
+assert "".join(topological_order(test_graph)) == "CABDFE"
+# the order is computed on a copy of the in-degrees, so the graph is reusable
+assert test_graph.indegree == (1, 1, 0, 1, 3, 1)
+assert "".join(topological_order(test_graph)) == "CABDFE"
+
 #%%
 with open("input.txt", "r") as target:
     lines = target.readlines()
 
 tl = parse(lines)
-get_seq(tl)
+graph = build_graph(tl)
+assert "".join(topological_order(graph)) == get_seq(tl)
 
 #%%
 
@@ -117,3 +161,102 @@ tl = parse(lines)
 get_time(tl, 5)
 
 #%%
+import random
+import time
+from typing import Callable
+
+
+class Schedule(NamedTuple):
+    makespan: int
+    # per worker: (task id, start, end) in the order the tasks were done
+    timelines: List[List[Tuple[str, int, int]]]
+
+
+def letter_duration(delta: int = 60) -> Callable[[str], int]:
+    # A = 1 ... Z = 26, then AA = 27, AB = 28, ... like spreadsheet columns
+    def duration(id: str) -> int:
+        number = 0
+        for c in id:
+            number = number * 26 + ord(c) - ord("A") + 1
+        return number + delta
+
+    return duration
+
+
+def simulate(
+    graph: Graph, n_workers: int, duration: Callable[[str], int] = letter_duration()
+) -> Schedule:
+    indegree = list(graph.indegree)
+    ready = [i for i, d in enumerate(indegree) if d == 0]
+    heapq.heapify(ready)
+    idle = list(range(n_workers))
+    events: List[Tuple[int, int, int]] = []
+    timelines: List[List[Tuple[str, int, int]]] = [[] for _ in range(n_workers)]
+    now = 0
+
+    while True:
+        while ready and idle:
+            task, worker = heapq.heappop(ready), heapq.heappop(idle)
+            end = now + duration(graph.ids[task])
+            timelines[worker].append((graph.ids[task], now, end))
+            heapq.heappush(events, (end, worker, task))
+        if not events:
+            break
+        # complete everything finishing at the same time before assigning
+        now = events[0][0]
+        while events and events[0][0] == now:
+            _, worker, task = heapq.heappop(events)
+            heapq.heappush(idle, worker)
+            for f in graph.followers[task]:
+                indegree[f] -= 1
+                if indegree[f] == 0:
+                    heapq.heappush(ready, f)
+    return Schedule(now, timelines)
+
+
+test_schedule = simulate(build_graph(parse(test_lines)), 2, letter_duration(0))
+assert test_schedule.makespan == 15
+assert test_schedule.timelines[0] == [
+    ("C", 0, 3), ("A", 3, 4), ("B", 4, 6), ("D", 6, 10), ("E", 10, 15)
+]
+assert test_schedule.timelines[1] == [("F", 3, 9)]
+assert [letter_duration(0)(id) for id in ["A", "Z", "AA", "BC"]] == [1, 26, 27, 55]
+
+multi_char_lines = [
+    "Step AB must be finished before step B can begin.",
+    "Step A must be finished before step B can begin.",
+]
+assert simulate(build_graph(parse(multi_char_lines)), 2, letter_duration(0)).makespan == 30
+
+#%%
+simulate(graph, 5).makespan
+
+#%%
+
+
+def random_graph(n_tasks: int, n_edges: int) -> Graph:
+    ids = tuple(f"{i:07d}" for i in range(n_tasks))
+    followers: List[List[int]] = [[] for _ in range(n_tasks)]
+    indegree = [0] * n_tasks
+    for _ in range(n_edges):
+        a, b = sorted(random.sample(range(n_tasks), 2))
+        followers[a].append(b)
+        indegree[b] += 1
+    return Graph(ids, tuple(tuple(f) for f in followers), tuple(indegree))
+
+
+def benchmark_simulate(n_tasks: int = 200_000, n_edges: int = 400_000, n_workers: int = 2_000):
+    graph = random_graph(n_tasks, n_edges)
+    start = time.perf_counter()
+    schedule = simulate(graph, n_workers, lambda id: int(id[-2:]) + 1)
+    elapsed = time.perf_counter() - start
+    print(f"{n_tasks} tasks on {n_workers} workers: makespan {schedule.makespan} in {elapsed:.2f}s")
+
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    benchmark_simulate()
+
+#%%
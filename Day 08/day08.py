@@ -79,3 +79,150 @@ node, _ = get_node(data)
 print(f"Root node value is {node.value}")
 
 #%%
+from array import array
+from typing import Sequence
+
+
+class FlatTree(NamedTuple):
+    # nodes in preorder; the children of node i are
+    # childs[child_start[i] : child_start[i] + n_childs[i]] and its metadata
+    # is data[meta_start[i] : meta_start[i] + n_metadata[i]]
+    n_childs: array
+    n_metadata: array
+    child_start: array
+    childs: array
+    meta_start: array
+    value: array
+    metadata_sum: int
+
+
+def parse_flat(data: Sequence[int]) -> FlatTree:
+    n_childs, n_metadata = array("q"), array("q")
+    child_start, childs = array("q"), array("q")
+    meta_start, value = array("q"), array("q")
+    metadata_sum = 0
+
+    def read_header(pos: int) -> int:
+        n_childs.append(data[pos])
+        n_metadata.append(data[pos + 1])
+        child_start.append(len(childs))
+        childs.extend([0] * data[pos])
+        meta_start.append(0)
+        value.append(0)
+        return len(value) - 1
+
+    pos = 2
+    # frames of [node, number of children already read]
+    stack = [[read_header(0), 0]]
+    while stack:
+        frame = stack[-1]
+        node, done = frame
+        if done < n_childs[node]:
+            child = read_header(pos)
+            pos += 2
+            childs[child_start[node] + done] = child
+            frame[1] += 1
+            stack.append([child, 0])
+            continue
+
+        stack.pop()
+        metadata = data[pos : pos + n_metadata[node]]
+        meta_start[node] = pos
+        pos += n_metadata[node]
+        metadata_sum += sum(metadata)
+        if n_childs[node] == 0:
+            value[node] = sum(metadata)
+        else:
+            first = child_start[node]
+            value[node] = sum(
+                value[childs[first + i - 1]] for i in metadata if 0 < i <= n_childs[node]
+            )
+
+    assert pos == len(data)
+    return FlatTree(n_childs, n_metadata, child_start, childs, meta_start, value, metadata_sum)
+
+
+test_tree = parse_flat([int(n) for n in test_line.split()])
+assert test_tree.metadata_sum == 138
+assert test_tree.value[0] == 66
+
+tree = parse_flat(data)
+assert tree.metadata_sum == sum_metadata(node)
+assert tree.value[0] == node.value
+
+#%%
+import io
+import mmap
+from typing import BinaryIO, Iterator, Union
+
+
+def iter_tokens(source: Union[str, BinaryIO], chunk_size: int = 1 << 20) -> Iterator[int]:
+    # source is a path (read through mmap), a binary file object or an mmap
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from iter_tokens(mm, chunk_size)
+        return
+
+    tail = b""
+    while True:
+        block = source.read(chunk_size)
+        if not block:
+            break
+        tokens = (tail + block).split()
+        # the last token may continue in the next block
+        tail = b"" if block[-1:].isspace() else tokens.pop()
+        yield from map(int, tokens)
+    if tail:
+        yield int(tail)
+
+
+def take(tokens: Iterator[int]) -> int:
+    token = next(tokens, None)
+    if token is None:
+        raise ValueError("license stream is empty or truncated")
+    return token
+
+
+def stream_license(source: Union[str, BinaryIO], chunk_size: int = 1 << 20) -> Tuple[int, int]:
+    tokens = iter_tokens(source, chunk_size)
+    metadata_sum = 0
+    root_value = 0
+    # frames of [n_childs, n_metadata, values of the children read so far]
+    stack = [[take(tokens), take(tokens), []]]
+    while stack:
+        n_childs, n_metadata, values = stack[-1]
+        if len(values) < n_childs:
+            stack.append([take(tokens), take(tokens), []])
+            continue
+
+        stack.pop()
+        metadata = [take(tokens) for _ in range(n_metadata)]
+        metadata_sum += sum(metadata)
+        if n_childs == 0:
+            value = sum(metadata)
+        else:
+            value = sum(values[i - 1] for i in metadata if 0 < i <= n_childs)
+        if stack:
+            stack[-1][2].append(value)
+        else:
+            root_value = value
+    if next(tokens, None) is not None:
+        raise ValueError("license stream has data after the root node")
+    return metadata_sum, root_value
+
+
+assert stream_license(io.BytesIO(test_line.encode()), chunk_size=3) == (138, 66)
+assert stream_license("input.txt") == (tree.metadata_sum, tree.value[0])
+
+for broken in [b"", b"2 3 0 3 10 11 12 1 1 0 1 99 2 1 1", b"0 1 5 7"]:
+    try:
+        stream_license(io.BytesIO(broken))
+    except ValueError:
+        pass
+    else:
+        assert False, broken
+
+#%%
@@ -61,9 +61,99 @@ assert all([play(game) == result for game, result in zip(test_games[:5], test_re
 #%%
 play(parse_line(line))
 
+#%%
+import numpy as np
+
+
+def play_array(game: Game) -> int:
+    score = np.zeros(game.players, dtype=np.int64)
+    dtype = np.int32 if game.max_marble < 2 ** 31 else np.int64
+    # the circle is circle[head:end] read clockwise, the current marble last;
+    # room is left before head for the marbles moved back to the front
+    circle = np.zeros(2 * game.max_marble + 64, dtype=dtype)
+    head, end = 8, 9
+    marble = 1
+
+    while marble <= game.max_marble:
+        live = end - head
+        full_blocks = (game.max_marble - marble + 1) // 23
+        if marble % 23 != 1 or live < 22 or full_blocks == 0:
+            # single marble
+            if marble % 23:
+                circle[end] = circle[head]
+                circle[end + 1] = marble
+                head += 1
+                end += 2
+            else:
+                tail = circle[end - 7 : end].copy()
+                score[(marble - 1) % game.players] += marble + int(circle[end - 8])
+                end -= 8
+                head -= 6
+                circle[head : head + 6] = tail[1:]
+                circle[end] = tail[0]
+                end += 1
+            marble += 1
+            continue
+
+        # a block of 22 placements moves the 22 front marbles f0..f21 behind
+        # the current one, each followed by a new marble m0..m21; the special
+        # marble then removes f18, keeps m18 as current and moves
+        # f19 m19 f20 m20 f21 m21 back to the front of the next block.
+        # k blocks at once, as long as they only read marbles that were in
+        # the circle before the first one
+        k = min((live - 22) // 16 + 1, full_blocks)
+        j = np.arange(k)
+        placed = marble + 23 * j[:, None] + np.arange(22)
+        fronts = np.empty((k, 22), dtype=dtype)
+        fronts[:, 6:] = circle[head + 16 * j[:, None] + np.arange(6, 22)]
+        fronts[0, :6] = circle[head : head + 6]
+        fronts[1:, 0:6:2] = fronts[:-1, 19:22]
+        fronts[1:, 1:6:2] = placed[:-1, 19:22]
+
+        out = np.empty((k, 37), dtype=dtype)
+        out[:, 0:36:2] = fronts[:, :18]
+        out[:, 1:36:2] = placed[:, :18]
+        out[:, 36] = placed[:, 18]
+        circle[end : end + 37 * k] = out.ravel()
+        end += 37 * k
+
+        special = marble + 23 * j + 22
+        np.add.at(score, (special - 1) % game.players, special + fronts[:, 18])
+
+        head += 16 * k
+        circle[head : head + 6:2] = fronts[-1, 19:22]
+        circle[head + 1 : head + 6:2] = placed[-1, 19:22]
+        marble += 23 * k
+    return int(score.max())
+
+
+assert play_array(Game(9, 25)) == 32
+assert all([play_array(game) == result for game, result in zip(test_games, test_results)])
+assert play_array(parse_line(line)) == play(parse_line(line))
+
 #%%
 line2 = "428 players; last marble is worth 7082500 points"
 
-play(parse_line(line2))
+play_array(parse_line(line2))
+
+#%%
+import time
+
+
+def benchmark_play(max_marbles=(10 ** 6, 10 ** 7, 10 ** 8), deque_limit=10 ** 7):
+    for max_marble in max_marbles:
+        game = Game(428, max_marble)
+        funcs = [play_array] + ([play] if max_marble <= deque_limit else [])
+        for f in funcs:
+            start = time.perf_counter()
+            f(game)
+            print(f"{f.__name__} {max_marble}: {time.perf_counter() - start:.2f}s")
+
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    benchmark_play()
 
 #%%
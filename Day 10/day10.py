@@ -121,4 +121,169 @@ points = parse_lines(lines)
 play_sequence(points)
 
 
+#%%
+from typing import Callable
+
+
+class Particles(NamedTuple):
+    position: np.ndarray
+    velocity: np.ndarray
+
+
+def to_particles(points: List[Point]) -> Particles:
+    data = np.array(points, dtype=np.int64).reshape(-1, 4)
+    return Particles(data[:, :2], data[:, 2:])
+
+
+def positions_at(particles: Particles, t: int) -> np.ndarray:
+    return particles.position + t * particles.velocity
+
+
+def extent_at(particles: Particles, t: int) -> np.ndarray:
+    pos = positions_at(particles, t)
+    return pos.max(axis=0) - pos.min(axis=0) + 1
+
+
+def area_at(particles: Particles, t: int) -> int:
+    width, height = extent_at(particles, t)
+    return int(width) * int(height)
+
+
+def descend(f: Callable[[int], int], t: int) -> int:
+    for step in [-1, 1]:
+        while t + step >= 0 and f(t + step) < f(t):
+            t += step
+    return t
+
+
+def convergence_time(particles: Particles) -> int:
+    # closed-form time of least spread (minimal sum of squared distances to
+    # the centroid) as a starting point. The width and the height are each
+    # convex in t, so a descent finds their minima; their product is not, but
+    # outside the two minima both grow, so the least area lies between them
+    dp = particles.position - particles.position.mean(axis=0)
+    dv = particles.velocity - particles.velocity.mean(axis=0)
+    speed = float((dv * dv).sum())
+    t = max(0, int(round(-float((dp * dv).sum()) / speed))) if speed else 0
+
+    t_width = descend(lambda t: int(extent_at(particles, t)[0]), t)
+    t_height = descend(lambda t: int(extent_at(particles, t)[1]), t)
+    start, stop = sorted([t_width, t_height])
+    return min(range(start, stop + 1), key=lambda t: area_at(particles, t))
+
+
+def play_sequence_np(points: List[Point]) -> int:
+    particles = to_particles(points)
+    t = convergence_time(particles)
+    pos = positions_at(particles, t)
+    plot_points([Point(int(x), int(y), 0, 0) for x, y in pos])
+    return t
+
+
+test_particles = to_particles(test_points)
+assert convergence_time(test_particles) == 3
+assert area_at(test_particles, 3) == 80
+
+far = Particles(
+    test_particles.position - 10 ** 9 * test_particles.velocity, test_particles.velocity
+)
+assert convergence_time(far) == 10 ** 9 + 3
+
+# x and y converge at different times, with a local minimum of the area
+# in between
+skewed = Particles(
+    np.array([[0, 0], [-20 - 2 * 18000, 17 + 3 * 18000]]), np.array([[0, 0], [2, -3]])
+)
+assert convergence_time(skewed) == 18010
+assert area_at(skewed, 18010) == 14
+
+#%%
+play_sequence_np(points)
+
+#%%
+import io
+import sys
+from typing import TextIO
+
+FONT_LETTERS = "ABCEFGHJKLNPRXZ"
+FONT = """
+..##....#####....####...######..######...####...#....#.....###..#....#..#.......#....#..#####...#####...#....#..######
+.#..#...#....#..#....#..#.......#.......#....#..#....#......#...#...#...#.......##...#..#....#..#....#..#....#.......#
+#....#..#....#..#.......#.......#.......#.......#....#......#...#..#....#.......##...#..#....#..#....#...#..#........#
+#....#..#....#..#.......#.......#.......#.......#....#......#...#.#.....#.......#.#..#..#....#..#....#...#..#.......#.
+#....#..#####...#.......#####...#####...#.......######......#...##......#.......#.#..#..#####...#####.....##.......#..
+######..#....#..#.......#.......#.......#..###..#....#......#...##......#.......#..#.#..#.......#..#......##......#...
+#....#..#....#..#.......#.......#.......#....#..#....#......#...#.#.....#.......#..#.#..#.......#...#....#..#....#....
+#....#..#....#..#.......#.......#.......#....#..#....#..#...#...#..#....#.......#...##..#.......#...#....#..#...#.....
+#....#..#....#..#....#..#.......#.......#...##..#....#..#...#...#...#...#.......#...##..#.......#....#..#....#..#.....
+#....#..#####....####...######..#........###.#..#....#...###....#....#..######..#....#..#.......#....#..#....#..######
+""".split()
+
+
+def render(pos: np.ndarray) -> np.ndarray:
+    # bitmap[y, x], cropped to the bounding box
+    pos = pos - pos.min(axis=0)
+    bitmap = np.zeros(tuple(pos.max(axis=0)[::-1] + 1), dtype=bool)
+    bitmap[pos[:, 1], pos[:, 0]] = True
+    return bitmap
+
+
+def write_frame(bitmap: np.ndarray, out: TextIO = sys.stdout):
+    chars = np.where(bitmap, ord("#"), ord("_")).astype(np.uint8)
+    lines = np.hstack([chars, np.full((len(chars), 1), ord("\n"), dtype=np.uint8)])
+    out.write(lines.tobytes().decode())
+
+
+def glyph_key(glyph: np.ndarray) -> bytes:
+    return np.packbits(glyph).tobytes()
+
+
+FONT_BITMAP = np.array([[c == "#" for c in row] for row in FONT])
+GLYPHS = {
+    glyph_key(FONT_BITMAP[:, 8 * i : 8 * i + 6]): letter
+    for i, letter in enumerate(FONT_LETTERS)
+}
+
+
+def read_message(bitmap: np.ndarray) -> str:
+    if bitmap.shape[0] != 10:
+        return "?"
+    return "".join(
+        GLYPHS.get(glyph_key(bitmap[:, i : i + 6]), "?")
+        for i in range(0, bitmap.shape[1], 8)
+    )
+
+
+def decode_message(lines: List[str]) -> Tuple[str, int]:
+    particles = to_particles(parse_lines(lines))
+    t = convergence_time(particles)
+    return read_message(render(positions_at(particles, t))), t
+
+
+letter_b = np.array([[c == "#" for c in row] for row in """
+#####.
+#....#
+#....#
+#....#
+#####.
+#....#
+#....#
+#....#
+#....#
+#####.
+""".split()])
+assert read_message(np.hstack([letter_b, np.zeros((10, 2), dtype=bool), letter_b])) == "BB"
+assert read_message(render(positions_at(test_particles, 3))) == "?"
+
+buffer = io.StringIO()
+write_frame(render(positions_at(test_particles, 3)), buffer)
+assert buffer.getvalue().splitlines()[0] == "#___#__###"
+
+#%%
+particles = to_particles(points)
+frame = render(positions_at(particles, convergence_time(particles)))
+write_frame(frame)
+assert read_message(frame) == "BLGNHPJC"
+assert decode_message(lines) == ("BLGNHPJC", 10476)
+
 #%%
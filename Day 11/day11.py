@@ -196,3 +196,156 @@ assert largest_power_sat(42) == (232, 251, 12, 119)
 largest_power_sat(18, grid_size = 3)
 
 #%%
+import time
+from typing import Iterable, Optional
+
+
+def power_grid(serial_number: int, grid_size: int = 300) -> np.ndarray:
+    # powers[y - 1, x - 1], for 1 <= x, y <= grid_size
+    x = np.arange(1, grid_size + 1, dtype=np.int64)
+    y = x[:, None]
+    rack_id = x + 10
+    return ((rack_id * y + serial_number) * rack_id // 100) % 10 - 5
+
+
+def summed_area(powers: np.ndarray) -> np.ndarray:
+    # sat[j, i] is the sum of powers[:j, :i]
+    sat = np.zeros((powers.shape[0] + 1, powers.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(powers, axis=0), axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def best_in_sat(sat: np.ndarray, sizes: Iterable[int]) -> Tuple[int, int, int, int]:
+    best = (0, 0, 0, np.iinfo(np.int64).min)
+    for size in sizes:
+        windows = (
+            sat[size:, size:]
+            - sat[:-size, size:]
+            - sat[size:, :-size]
+            + sat[:-size, :-size]
+        )
+        j, i = np.unravel_index(np.argmax(windows), windows.shape)
+        if windows[j, i] > best[3]:
+            best = (int(i) + 1, int(j) + 1, size, int(windows[j, i]))
+    return best
+
+
+def best_square(
+    serial_number: int, grid_size: int = 300, sizes: Optional[Iterable[int]] = None
+) -> Tuple[int, int, int, int]:
+    sat = summed_area(power_grid(serial_number, grid_size))
+    return best_in_sat(sat, range(1, grid_size + 1) if sizes is None else sizes)
+
+
+assert power_grid(8)[4, 2] == power_level(3, 5, 8)
+assert power_grid(57)[78, 121] == power_level(122, 79, 57)
+assert best_square(18, sizes=[3]) == (33, 45, 3, 29)
+assert best_square(42, sizes=[3]) == (21, 61, 3, 30)
+assert best_square(18) == (90, 269, 16, 113)
+assert best_square(42) == (232, 251, 12, 119)
+
+#%%
+best_square(7803)
+
+#%%
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    start = time.perf_counter()
+    print(best_square(7803), f"{time.perf_counter() - start:.3f}s")
+    print(best_square(7803, grid_size=3000, sizes=range(1, 51)))
+
+#%%
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+
+@lru_cache(maxsize=8)
+def rack_terms(grid_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    # the serial independent part of power_level: rack_id and rack_id * y
+    x = np.arange(1, grid_size + 1, dtype=np.int64)
+    rack_id = x + 10
+    return rack_id, rack_id * x[:, None]
+
+
+def best_square_shared(args: Tuple[int, int, Sequence[int]]) -> Tuple[int, int, int, int]:
+    serial_number, grid_size, sizes = args
+    rack_id, rack_y = rack_terms(grid_size)
+    powers = ((rack_y + serial_number) * rack_id // 100) % 10 - 5
+    return best_in_sat(summed_area(powers), sizes)
+
+
+class SweepCache:
+    # least recently used results, keyed by (serial, grid_size, sizes)
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._results: OrderedDict = OrderedDict()
+
+    def get(self, key: Tuple[int, int, Sequence[int]]) -> Optional[Tuple[int, int, int, int]]:
+        if key not in self._results:
+            return None
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key: Tuple[int, int, Sequence[int]], result: Tuple[int, int, int, int]):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+
+sweep_cache = SweepCache()
+
+
+def sweep_serials(
+    serial_numbers: Iterable[int],
+    grid_size: int = 300,
+    sizes: Optional[Iterable[int]] = None,
+    processes: int = 1,
+    cache: SweepCache = sweep_cache,
+) -> Dict[int, Tuple[int, int, int, int]]:
+    # the sizes go in the cache key, so anything but a range becomes a tuple
+    if sizes is None:
+        sizes = range(1, grid_size + 1)
+    elif not isinstance(sizes, range):
+        sizes = tuple(int(size) for size in sizes)
+    results: Dict[int, Tuple[int, int, int, int]] = {}
+    missing: List[Tuple[int, int, Sequence[int]]] = []
+    for serial_number in dict.fromkeys(int(s) for s in serial_numbers):
+        key = (serial_number, grid_size, sizes)
+        cached = cache.get(key)
+        if cached is None:
+            missing.append(key)
+        else:
+            results[serial_number] = cached
+
+    # rack_terms is cached per process, so a pool only pays off for big grids
+    if processes == 1 or len(missing) <= 1:
+        computed = list(map(best_square_shared, missing))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            computed = list(pool.map(best_square_shared, missing))
+    for key, result in zip(missing, computed):
+        cache.put(key, result)
+        results[key[0]] = result
+    return results
+
+
+assert sweep_serials(np.array([18, 42])) == {
+    18: (90, 269, 16, 113),
+    42: (232, 251, 12, 119),
+}
+assert sweep_serials([18], sizes=range(3, 4)) == {18: (33, 45, 3, 29)}
+assert sweep_serials([18, 42], sizes=[3]) == {18: (33, 45, 3, 29), 42: (21, 61, 3, 30)}
+assert sweep_cache.get((18, 300, (3,))) == (33, 45, 3, 29)
+assert sweep_cache.get((42, 300, range(1, 301))) == (232, 251, 12, 119)
+
+#%%
+if RUN_BENCHMARK:
+    start = time.perf_counter()
+    sweep = sweep_serials(range(7750, 7850))
+    print(sweep[7803], f"{time.perf_counter() - start:.2f}s")
+
+#%%
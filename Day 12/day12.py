@@ -139,6 +139,122 @@ state, i_zero = forward_generations(initial_state, notes, 20)
 count(state, i_zero)
 
 #%%
+from typing import Callable, Optional
+
+
+class PotRow(NamedTuple):
+    # bit i of state is pot offset + i; bit 0 is always a plant
+    state: int
+    offset: int
+
+
+def to_row(state: str, offset: int = 0) -> PotRow:
+    bits = int(state[::-1].replace("#", "1").replace(".", "0"), 2)
+    return normalize(PotRow(bits, offset))
+
+
+def normalize(row: PotRow) -> PotRow:
+    if row.state == 0:
+        return PotRow(0, 0)
+    trailing = (row.state & -row.state).bit_length() - 1
+    return PotRow(row.state >> trailing, row.offset + trailing)
+
+
+def rule_table(notes: Notes) -> List[bool]:
+    # table[16 * l2 + 8 * l1 + 4 * c + 2 * r1 + r2]
+    table = [False] * 32
+    for code, result in notes.items():
+        index = int(code.replace("#", "1").replace(".", "0"), 2)
+        table[index] = result == "#"
+    assert not table[0], "empty pots would grow plants forever"
+    return table
+
+
+def compile_rules(notes: Notes) -> Callable[[int, int, int, int, int, int], int]:
+    # x0 ... x4 hold the pots l2, l1, c, r1, r2 of every position as bits;
+    # the result ORs, for every "#" entry of the table, the AND of x_k or
+    # x_k ^ m for its five bits. Products over the first bits are shared
+    # between entries, dropped when no entry below them is "#", and ORed
+    # in as soon as every entry below them is "#"
+    table = rule_table(notes)
+
+    # plan[k]: (product to extend, bit of x_k, whether it is complete)
+    plan: List[List[Tuple[int, int, bool]]] = []
+    prefixes = [0]
+    for k in range(5):
+        steps = []
+        next_prefixes = []
+        for i, prefix in enumerate(prefixes):
+            for bit in [0, 1]:
+                index = 2 * prefix + bit
+                below = table[index << (4 - k) : (index + 1) << (4 - k)]
+                if all(below):
+                    steps.append((i, bit, True))
+                elif any(below):
+                    steps.append((i, bit, False))
+                    next_prefixes.append(index)
+        plan.append(steps)
+        prefixes = next_prefixes
+
+    def rules(x0: int, x1: int, x2: int, x3: int, x4: int, m: int) -> int:
+        result = 0
+        products = [m]
+        for x, steps in zip([x0, x1, x2, x3, x4], plan):
+            literals = [x ^ m, x]
+            next_products = []
+            for i, bit, complete in steps:
+                if complete:
+                    result |= products[i] & literals[bit]
+                else:
+                    next_products.append(products[i] & literals[bit])
+            products = next_products
+        return result
+
+    return rules
+
+
+def step_row(row: PotRow, rules: Callable[[int, int, int, int, int, int], int]) -> PotRow:
+    # the new row starts 2 pots to the left; bit q of state >> k is pot
+    # new offset + q + k - 2, so state >> 0 is the left-most neighbour
+    state = row.state << 4
+    mask = (1 << state.bit_length()) - 1
+    new = rules(state, state >> 1, state >> 2, state >> 3, state >> 4, mask)
+    return normalize(PotRow(new, row.offset - 2))
+
+
+def forward_row(row: PotRow, notes: Notes, generations: int) -> PotRow:
+    rules = compile_rules(notes)
+    for _ in range(generations):
+        row = step_row(row, rules)
+    return row
+
+
+def count_row(row: PotRow) -> int:
+    bits = [i for i, b in enumerate(bin(row.state)[:1:-1]) if b == "1"]
+    return sum(bits) + row.offset * len(bits)
+
+
+for i in range(1, 21):
+    row = forward_row(to_row(test_initial_state), test_notes, i)
+    state, i_zero = crop(*forward_generations(test_initial_state, test_notes, i))
+    assert row == to_row(state, -i_zero)
+    assert row == to_row(test_results[i], -3)
+assert count_row(forward_row(to_row(test_initial_state), test_notes, 20)) == 325
+assert count_row(forward_row(to_row(initial_state), notes, 20)) == count(
+    *forward_generations(initial_state, notes, 20)
+)
+
+#%%
+assert count_row(forward_row(to_row(initial_state), notes, 200)) == count(
+    *forward_generations(initial_state, notes, 200)
+)
+
+RUN_BENCHMARK = False
+
+if RUN_BENCHMARK:
+    print(count_row(forward_row(to_row(initial_state), notes, 1_000_000)))
+
+#%%
 
 
 def search_loop(
@@ -187,3 +303,76 @@ if has_loop:
     i_zero += i_delta * delta_t
     print(count(state, i_zero))
 
+#%%
+
+
+class Periodicity(NamedTuple):
+    transient: int
+    period: int
+    # pots moved per period
+    shift: int
+    # (count, plants) for each generation transient ... transient + period - 1
+    phases: List[Tuple[int, int]]
+
+
+def find_period(
+    row: PotRow, notes: Notes, max_generations: int = 1_000_000
+) -> Optional[Periodicity]:
+    # Brent's algorithm on the normalized state, ignoring the offset
+    rules = compile_rules(notes)
+    power = period = 1
+    tortoise, hare = row, step_row(row, rules)
+    steps = 1
+    while tortoise.state != hare.state:
+        if steps >= max_generations:
+            return None
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step_row(hare, rules)
+        period += 1
+        steps += 1
+
+    tortoise = hare = row
+    for _ in range(period):
+        hare = step_row(hare, rules)
+    transient = 0
+    while tortoise.state != hare.state:
+        tortoise, hare = step_row(tortoise, rules), step_row(hare, rules)
+        transient += 1
+
+    shift = hare.offset - tortoise.offset
+    phases = []
+    for _ in range(period):
+        phases.append((count_row(tortoise), bin(tortoise.state).count("1")))
+        tortoise = step_row(tortoise, rules)
+    return Periodicity(transient, period, shift, phases)
+
+
+def count_at(periodicity: Periodicity, generation: int) -> int:
+    assert generation >= periodicity.transient
+    periods, phase = divmod(generation - periodicity.transient, periodicity.period)
+    total, plants = periodicity.phases[phase]
+    return total + periods * periodicity.shift * plants
+
+
+def count_generation(
+    state: str, notes: Notes, generation: int, max_generations: int = 1_000_000
+) -> int:
+    row = to_row(state)
+    periodicity = find_period(row, notes, min(generation, max_generations))
+    if periodicity is None or generation < periodicity.transient:
+        return count_row(forward_row(row, notes, generation))
+    return count_at(periodicity, generation)
+
+
+for g in [0, 1, 20, 100, 1000]:
+    assert count_generation(test_initial_state, test_notes, g) == count_row(
+        forward_row(to_row(test_initial_state), test_notes, g)
+    )
+    assert count_generation(initial_state, notes, g) == count_row(
+        forward_row(to_row(initial_state), notes, g)
+    )
+if has_loop:
+    assert count_generation(initial_state, notes, 50_000_000_000) == count(state, i_zero)
@@ -183,3 +183,181 @@ map = Map(txt)
 map.move(30000)
 
 #%%
+from typing import Dict
+
+# directions, clockwise
+UP, RIGHT, DOWN, LEFT = range(4)
+CART_DIRECTIONS = {ord("^"): UP, ord(">"): RIGHT, ord("v"): DOWN, ord("<"): LEFT}
+CART_TRACKS = {UP: ord("|"), DOWN: ord("|"), LEFT: ord("-"), RIGHT: ord("-")}
+
+
+def transition_tables() -> Tuple[List[int], List[int]]:
+    # new direction and new turn state at index (cell * 4 + direction) * 3 + turn;
+    # at intersections carts turn left, go straight, turn right, in turn
+    directions = []
+    turns = []
+    for cell in range(256):
+        for d in range(4):
+            for turn in range(3):
+                new_turn = turn
+                if cell == ord("/"):
+                    d_new = [RIGHT, UP, LEFT, DOWN][d]
+                elif cell == ord("\\"):
+                    d_new = [LEFT, DOWN, RIGHT, UP][d]
+                elif cell == ord("+"):
+                    d_new = (d + turn - 1) % 4
+                    new_turn = (turn + 1) % 3
+                else:
+                    d_new = d
+                directions.append(d_new)
+                turns.append(new_turn)
+    return directions, turns
+
+
+NEXT_DIRECTION, NEXT_TURN = transition_tables()
+
+
+class CartTrack:
+    def __init__(self, paths: str):
+        lines = paths.splitlines()
+        self.width = max(len(l) for l in lines)
+        grid = bytearray("".join(l.ljust(self.width) for l in lines).encode())
+
+        # carts as parallel arrays, positions as flat indices y * width + x
+        self.pos: List[int] = []
+        self.dir: List[int] = []
+        self.turn: List[int] = []
+        self.alive: List[bool] = []
+        for p, c in enumerate(grid):
+            if c in CART_DIRECTIONS:
+                self.pos.append(p)
+                self.dir.append(CART_DIRECTIONS[c])
+                self.turn.append(0)
+                self.alive.append(True)
+                grid[p] = CART_TRACKS[CART_DIRECTIONS[c]]
+        self.grid = bytes(grid)
+        self.steps = [-self.width, 1, self.width, -1]
+        self.occupied: Dict[int, int] = {p: i for i, p in enumerate(self.pos)}
+        self.order = list(range(len(self.pos)))
+        self.remaining = len(self.pos)
+
+    def xy(self, p: int) -> Tuple[int, int]:
+        return p % self.width, p // self.width
+
+    def tick(self) -> List[Tuple[int, int, int, int]]:
+        # moves every cart once in reading order; returns (x, y, cart, other)
+        # for every crash
+        crashes = []
+        grid, steps, occupied = self.grid, self.steps, self.occupied
+        pos, dir, turn, alive = self.pos, self.dir, self.turn, self.alive
+        self.order.sort(key=pos.__getitem__)
+        for i in self.order:
+            if not alive[i]:
+                continue
+            del occupied[pos[i]]
+            p = pos[i] + steps[dir[i]]
+            pos[i] = p
+            other = occupied.pop(p, None)
+            if other is not None:
+                alive[i] = alive[other] = False
+                self.remaining -= 2
+                crashes.append((*self.xy(p), i, other))
+                continue
+            occupied[p] = i
+            k = (grid[p] * 4 + dir[i]) * 3 + turn[i]
+            dir[i] = NEXT_DIRECTION[k]
+            turn[i] = NEXT_TURN[k]
+        self.order = [i for i in self.order if alive[i]]
+        return crashes
+
+    def positions(self) -> List[Tuple[int, int]]:
+        return [self.xy(self.pos[i]) for i in sorted(self.order, key=self.pos.__getitem__)]
+
+
+def first_crash(paths: str) -> Tuple[int, int]:
+    track = CartTrack(paths)
+    while True:
+        crashes = track.tick()
+        if crashes:
+            return crashes[0][:2]
+
+
+def last_cart(paths: str) -> Tuple[int, int]:
+    track = CartTrack(paths)
+    while track.remaining > 1:
+        track.tick()
+    return track.positions()[0]
+
+
+assert first_crash(TEST_MAP) == (7, 3)
+assert last_cart(new) == (6, 4)
+print(first_crash(txt), last_cart(txt))
+
+#%%
+from typing import NamedTuple, Optional, Union
+
+
+class Crash(NamedTuple):
+    tick: int
+    x: int
+    y: int
+    carts: Tuple[int, int]
+
+
+class Survivors(NamedTuple):
+    tick: int
+    positions: List[Tuple[int, int]]
+
+
+def cart_events(
+    paths: str, max_ticks: Optional[int] = None
+) -> Iterator[Union[Crash, Survivors]]:
+    # yields every crash as it happens, then the surviving carts: after the
+    # last crash, or at max_ticks if given. Once two carts or fewer are left
+    # their joint state is tracked, and a repeat means no crash can happen
+    # any more, so the remaining ticks are skipped a whole period at a time
+    track = CartTrack(paths)
+    tick = 0
+    seen: Dict[Tuple[int, ...], int] = {}
+    while max_ticks is None or tick < max_ticks:
+        if track.remaining <= 1 and max_ticks is None:
+            break
+        if track.remaining <= 2:
+            state = tuple(
+                v for i in track.order for v in (track.pos[i], track.dir[i], track.turn[i])
+            )
+            if state in seen:
+                if max_ticks is None:
+                    break
+                period = tick - seen[state]
+                tick += (max_ticks - tick) // period * period
+                seen.clear()
+                if tick == max_ticks:
+                    break
+            seen[state] = tick
+        crashes = track.tick()
+        tick += 1
+        for x, y, cart, other in crashes:
+            yield Crash(tick - 1, x, y, (cart, other))
+    yield Survivors(tick, track.positions())
+
+
+test_events = list(cart_events(TEST_MAP))
+assert test_events == [Crash(13, 7, 3, (0, 1)), Survivors(14, [])]
+
+new_events = list(cart_events(new))
+assert [e.tick for e in new_events[:-1]] == [0, 0, 0, 2]
+assert new_events[-1] == Survivors(3, [(6, 4)])
+
+events = list(cart_events(txt))
+assert (events[0].x, events[0].y) == first_crash(txt)
+assert events[-1].positions == [last_cart(txt)]
+
+loop = r"""/>-\
+|  |
+\-</"""
+assert list(cart_events(loop)) == [Survivors(5, [(1, 0), (2, 2)])]
+long_run = list(cart_events(loop, max_ticks=10 ** 12 + 2))
+assert long_run == [Survivors(10 ** 12 + 2, [(3, 0), (0, 2)])]
+
+#%%